@@ -7,16 +7,40 @@ from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse, FileResponse
+from fastapi.responses import RedirectResponse, FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+import orjson
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
 # import spacy  # Temporarily removed for deployment testing
 from pathlib import Path
+import asyncio
+import heapq
+import os
 import re
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from functools import lru_cache
+from itertools import accumulate
 import time
 from datetime import datetime
-app = FastAPI(title="Concordance API", description="A classroom-friendly concordancer")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the corpus cache before the server starts accepting requests"""
+    await warm_corpus_cache()
+    yield
+
+
+app = FastAPI(
+    title="Concordance API",
+    description="A classroom-friendly concordancer",
+    lifespan=lifespan
+)
 
 # Add compression middleware for better bandwidth usage
 app.add_middleware(GZipMiddleware, minimum_size=1000)
@@ -28,15 +52,46 @@ app.add_middleware(
     allow_credentials=False,  # Set to False when using wildcard
     allow_methods=["GET", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Line-Count", "X-Word-Count", "X-Char-Count"],  # Read by the file viewer
 )
 
 # spaCy model (placeholder for now)
 nlp = None
 
 # Corpus storage with caching and metadata
-corpora: Dict[str, List[str]] = {}
+# corpora is kept in least-recently-used order so the cache can be bounded
+corpora: OrderedDict[str, List[str]] = OrderedDict()
 corpus_metadata: Dict[str, Dict] = {}
 
+# Maximum number of corpora (lines, tokens and index) held in memory at once
+MAX_CACHED_CORPORA = 8
+
+# Rendered /search responses, keyed by request parameters and corpus mtime/size,
+# so repeated classroom queries skip lookup and serialization entirely
+result_cache: OrderedDict[Tuple, Tuple[float, bytes]] = OrderedDict()
+RESULT_CACHE_SIZE = 512
+RESULT_CACHE_TTL = 300  # seconds
+# Bounded by total bytes too, since a large context_size or page_size can make a single body megabytes
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+RESULT_CACHE_MAX_ENTRY_BYTES = 1024 * 1024  # Larger bodies are served but not cached
+result_cache_bytes = 0
+
+# /search-in-file results are flushed to the client in chunks of roughly this size
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Raw (and lazily lowercased) file bytes plus line offsets for /search-in-file, keyed like
+# corpora but kept apart so searching a file never tokenizes or indexes it
+file_buffers: OrderedDict[str, Dict] = OrderedDict()
+
+# /view line/word/char counts per corpus, as (file mtime_ns, size, counts)
+view_stats: Dict[str, Tuple[int, int, Dict[str, int]]] = {}
+
+# samples/ listing as (directory mtime_ns, corpus names); adding or removing a file changes the mtime
+corpus_listing: Optional[Tuple[int, List[str]]] = None
+
+# Guards the cache dicts: sync endpoints run concurrently in FastAPI's threadpool
+cache_lock = threading.Lock()
+
 # Pre-compiled regex for better tokenization performance
 TOKENIZE_REGEX = re.compile(r'\w+|[^\w\s]')
 
@@ -54,11 +109,19 @@ class KWICResult(BaseModel):
     line_number: int
 
 
+class KWICTextResult(BaseModel):
+    """KWIC result with each column pre-joined into a display string (default /search format)"""
+    left_text: str
+    match_text: str
+    right_text: str
+    line_number: int
+
+
 class SearchResponse(BaseModel):
     """Search response containing KWIC results"""
     query: str
     corpus: str
-    results: List[KWICResult]
+    results: Union[List[KWICTextResult], List[KWICResult]]
     total_hits: int
     page: int
     page_size: int
@@ -74,82 +137,298 @@ class FileContent(BaseModel):
     char_count: int
 
 
-def load_corpus(corpus_name: str) -> List[str]:
-    """Load corpus from samples directory with intelligent caching"""
+def resolve_corpus_path(corpus: str) -> Path:
+    """Return the samples/ path for a corpus, rejecting path traversal and unknown corpora"""
     # Basic security: prevent path traversal
-    if ".." in corpus_name or "/" in corpus_name or "\\" in corpus_name:
+    if ".." in corpus or "/" in corpus or "\\" in corpus:
         raise HTTPException(status_code=400, detail="Invalid corpus name")
-    
-    corpus_path = Path("samples") / f"{corpus_name}.txt"
-    
+
+    corpus_path = Path("samples") / f"{corpus}.txt"
+
     if not corpus_path.exists():
-        raise HTTPException(status_code=404, detail=f"Corpus '{corpus_name}' not found")
-    
+        raise HTTPException(status_code=404, detail=f"Corpus '{corpus}' not found")
+    return corpus_path
+
+
+def load_corpus(corpus_name: str) -> Dict:
+    """Load corpus from samples directory with intelligent caching
+
+    Returns the corpus metadata dict (index, tokens, counts). Callers should use
+    this snapshot rather than re-reading corpus_metadata, which another request may
+    clear or evict in the meantime.
+    """
+    corpus_path = resolve_corpus_path(corpus_name)
+
     # Check if corpus is cached and file hasn't changed
     file_stat = corpus_path.stat()
-    file_mtime = file_stat.st_mtime
+    # Integer nanoseconds: float st_mtime can round away quick successive writes
+    file_mtime = file_stat.st_mtime_ns
     file_size = file_stat.st_size
     
-    if corpus_name in corpora and corpus_name in corpus_metadata:
-        cached_metadata = corpus_metadata[corpus_name]
-        if (cached_metadata.get('mtime') == file_mtime and 
-            cached_metadata.get('size') == file_size):
-            # File unchanged, return cached version
-            cached_metadata['access_count'] = cached_metadata.get('access_count', 0) + 1
-            cached_metadata['last_accessed'] = datetime.now().isoformat()
-            return corpora[corpus_name]
+    with cache_lock:
+        if corpus_name in corpora and corpus_name in corpus_metadata:
+            cached_metadata = corpus_metadata[corpus_name]
+            if (cached_metadata.get('mtime') == file_mtime and 
+                cached_metadata.get('size') == file_size):
+                # File unchanged, return cached version
+                cached_metadata['access_count'] = cached_metadata.get('access_count', 0) + 1
+                cached_metadata['last_accessed'] = datetime.now().isoformat()
+                corpora.move_to_end(corpus_name)
+                return cached_metadata
     
     # Load file (not cached or file changed)
     try:
         start_time = time.time()
-        with open(corpus_path, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
-        
+        file_bytes = corpus_path.read_bytes()
+
+        # bytes.splitlines() breaks on \r\n, \r and \n exactly like text-mode readlines()
+        # (unlike str.splitlines(), which also breaks on \x0c, \u2028, ...), and each
+        # line is decoded on its own instead of decoding the whole file up front
+        strip = str.strip
+        lines = [line for line in (strip(raw.decode('utf-8')) for raw in file_bytes.splitlines()) if line]
+
+        # Tokenize once, storing each line as an array of integer token ids into a
+        # shared vocabulary (4 bytes per token instead of one str object per token)
+        vocab: Dict[str, int] = {}
+        token_ids_per_line = [
+            array('I', [vocab.setdefault(token, len(vocab)) for token in tokenize_line(line)])
+            for line in lines
+        ]
+        inv_vocab = list(vocab)
+        # Lowercase (and intern) once per distinct token rather than once per occurrence
+        lower_vocab = [sys.intern(token.lower()) for token in inv_vocab]
+
+        # Build an inverted index: lowercased token -> [(line_idx, tok_idx), ...]
+        # Only the first occurrence per line is indexed
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for i, token_ids in enumerate(token_ids_per_line):
+            first_positions: Dict[str, int] = {}
+            for j, token_id in enumerate(token_ids):
+                first_positions.setdefault(lower_vocab[token_id], j)
+            for token_lower, j in first_positions.items():
+                postings.setdefault(token_lower, []).append((i, j))
+
         load_time = time.time() - start_time
         
         # Cache the corpus and metadata
-        corpora[corpus_name] = lines
-        corpus_metadata[corpus_name] = {
+        metadata = {
             'mtime': file_mtime,
             'size': file_size,
             'line_count': len(lines),
+            'vocab': inv_vocab,
+            'token_ids_per_line': token_ids_per_line,
+            'postings': postings,
             'load_time': load_time,
             'loaded_at': datetime.now().isoformat(),
             'access_count': 1,
             'last_accessed': datetime.now().isoformat()
         }
+        with cache_lock:
+            corpora[corpus_name] = lines
+            corpus_metadata[corpus_name] = metadata
+            corpora.move_to_end(corpus_name)
+
+            # Evict least recently used corpora beyond the cache limit
+            while len(corpora) > MAX_CACHED_CORPORA:
+                evicted_name, _ = corpora.popitem(last=False)
+                corpus_metadata.pop(evicted_name, None)
         
-        return lines
+        return metadata
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading corpus: {str(e)}")
 
 
+def list_corpus_names() -> List[str]:
+    """List corpus names in samples/, re-reading the directory only when it changes"""
+    global corpus_listing
+    samples_dir = Path("samples")
+    try:
+        dir_mtime = samples_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+
+    listing = corpus_listing
+    if listing is None or listing[0] != dir_mtime:
+        listing = (dir_mtime, [f.stem for f in samples_dir.glob("*.txt")])
+        corpus_listing = listing
+    return listing[1]
+
+
+def get_cached_result(key: Tuple) -> Optional[bytes]:
+    """Return a cached response body if present and not expired"""
+    with cache_lock:
+        entry = result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, body = entry
+        if expires_at < time.monotonic():
+            drop_cached_result(key)
+            return None
+        result_cache.move_to_end(key)
+        return body
+
+
+def cache_result(key: Tuple, body: bytes):
+    """Store a response body, evicting the least recently used entries beyond the entry and byte limits"""
+    global result_cache_bytes
+    if len(body) > RESULT_CACHE_MAX_ENTRY_BYTES:
+        return
+    with cache_lock:
+        drop_cached_result(key)
+        result_cache[key] = (time.monotonic() + RESULT_CACHE_TTL, body)
+        result_cache_bytes += len(body)
+        while len(result_cache) > RESULT_CACHE_SIZE or result_cache_bytes > RESULT_CACHE_MAX_BYTES:
+            drop_cached_result(next(iter(result_cache)))
+
+
+def drop_cached_result(key: Tuple):
+    """Remove a cached response body if present; the caller must hold cache_lock"""
+    global result_cache_bytes
+    entry = result_cache.pop(key, None)
+    if entry is not None:
+        result_cache_bytes -= len(entry[1])
+
+
+async def warm_corpus_cache():
+    """Load and index the available corpora in worker threads so no student pays the cold load"""
+    names = list_corpus_names()[:MAX_CACHED_CORPORA]
+    results = await asyncio.gather(
+        *(asyncio.to_thread(load_corpus, name) for name in names),
+        return_exceptions=True
+    )
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            print(f"Could not preload corpus '{name}': {result}")
+
+
+def find_line_offsets(data: bytes) -> array:
+    """Return the byte offset at which each line of data starts"""
+    # bytes.splitlines() breaks on \r\n, \r and \n like text-mode readlines(),
+    # and the running sum of line lengths is computed without a Python-level loop
+    offsets = array('Q', [0])
+    offsets.extend(accumulate(map(len, data.splitlines(keepends=True))))
+    if data and not data.endswith((b'\n', b'\r')):
+        offsets.pop()  # The last line is unterminated, so no line starts at the end
+    return offsets
+
+
+def load_file_buffers(corpus_name: str) -> Dict:
+    """Return the cached file buffers for a corpus, re-reading the file when its mtime or size changes"""
+    corpus_path = resolve_corpus_path(corpus_name)
+    file_stat = corpus_path.stat()
+
+    with cache_lock:
+        buffers = file_buffers.get(corpus_name)
+        if buffers is not None and (buffers['mtime'], buffers['size']) == (file_stat.st_mtime_ns, file_stat.st_size):
+            file_buffers.move_to_end(corpus_name)
+            return buffers
+
+    try:
+        file_bytes = corpus_path.read_bytes()
+        # Validate once up front, so the matching lines decoded while streaming cannot fail
+        file_bytes.decode('utf-8')
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading corpus: {str(e)}")
+
+    buffers = {'mtime': file_stat.st_mtime_ns, 'size': file_stat.st_size, 'file_bytes': file_bytes}
+    with cache_lock:
+        file_buffers[corpus_name] = buffers
+        file_buffers.move_to_end(corpus_name)
+        while len(file_buffers) > MAX_CACHED_CORPORA:
+            file_buffers.popitem(last=False)
+    return buffers
+
+
+def load_file_bytes(buffers: Dict, case_sensitive: bool = True) -> Tuple[bytes, array]:
+    """Return the file buffer (lowercased if case-insensitive) plus its line offsets, built lazily in buffers
+
+    The case-sensitive buffer is the file bytes as read, so searching it needs no
+    copy or UTF-8 decode of the whole file.
+    """
+    if case_sensitive:
+        if 'line_offsets' not in buffers:
+            buffers['line_offsets'] = find_line_offsets(buffers['file_bytes'])
+        return buffers['file_bytes'], buffers['line_offsets']
+
+    if 'file_bytes_lower' not in buffers:
+        # Lowercase via str so non-ASCII letters fold the same way str.lower() does
+        data_lower = buffers['file_bytes'].decode('utf-8').lower().encode('utf-8')
+        buffers['file_bytes_lower'] = (data_lower, find_line_offsets(data_lower))
+    return buffers['file_bytes_lower']
+
+
+def iter_line_matches(haystack: bytes, line_offsets: array, needle: bytes) -> Iterator[Tuple[int, int]]:
+    """Yield (line index, match count) for each line of haystack containing needle, in file order"""
+    current_line, matches = -1, 0
+    pos = haystack.find(needle)
+    while pos != -1:
+        line_idx = bisect_right(line_offsets, pos) - 1
+        if line_idx != current_line:
+            if matches:
+                yield current_line, matches
+            current_line, matches = line_idx, 0
+        matches += 1
+        pos = haystack.find(needle, pos + len(needle))
+    if matches:
+        yield current_line, matches
+
+
 def tokenize_line(line: str) -> List[str]:
     """Optimized tokenization using pre-compiled regex"""
+    # Fast path: lines made only of letters, digits and spaces tokenize exactly
+    # like the regex (str.isalnum() is \w minus '_', for any script), so a plain
+    # split() avoids the regex engine
+    if line.replace(' ', '').isalnum():
+        return line.split()
     # Use pre-compiled regex for better performance
     tokens = TOKENIZE_REGEX.findall(line)
     return tokens
 
 
-def search_kwic(tokens: List[str], query: str, context_size: int = 5) -> Optional[KWICResult]:
-    """Search for exact match and return KWIC structure"""
-    query_lower = query.lower()
-    
-    for i, token in enumerate(tokens):
-        if token.lower() == query_lower:
-            # Calculate context boundaries
-            left_start = max(0, i - context_size)
-            right_end = min(len(tokens), i + 1 + context_size)
-            
-            return KWICResult(
-                left=tokens[left_start:i],
-                match=[token],  # Exact match as found
-                right=tokens[i + 1:right_end],
-                line_number=0  # Will be set by caller
-            )
-    
-    return None
+def split_query_terms(query: str) -> List[str]:
+    """Split a comma-separated query into its terms; anything else is one term"""
+    terms = [term.strip() for term in query.split(',') if term.strip()]
+    # Only a query with no terms at all (a bare ",") is searched exactly as typed
+    return terms or [query]
+
+
+def merge_postings(postings_lists: List[List[Tuple[int, int]]]) -> List[Tuple[int, int]]:
+    """Merge sorted postings lists, keeping the first match per line"""
+    merged = []
+    last_line_idx = -1
+    for line_idx, tok_idx in heapq.merge(*postings_lists):
+        if line_idx != last_line_idx:
+            merged.append((line_idx, tok_idx))
+            last_line_idx = line_idx
+    return merged
+
+
+def iter_kwic_hits(vocab: List[str], token_ids_per_line: List[array], postings: Iterable[Tuple[int, int]],
+                   context_size: int = 5, as_text: bool = False) -> Iterator[Dict]:
+    """Lazily build KWIC result dicts for (line_idx, tok_idx) postings
+
+    Dicts have the KWICTextResult shape if as_text is set, otherwise the KWICResult shape.
+    """
+    to_token = vocab.__getitem__
+    for line_idx, tok_idx in postings:
+        token_ids = token_ids_per_line[line_idx]
+        # Plain dicts skip Pydantic validation; orjson serializes them directly
+        if as_text:
+            # One string per column instead of a JSON list per column
+            yield {
+                "left_text": " ".join(map(to_token, token_ids[max(0, tok_idx - context_size):tok_idx])),
+                "match_text": vocab[token_ids[tok_idx]],
+                "right_text": " ".join(map(to_token, token_ids[tok_idx + 1:tok_idx + 1 + context_size])),
+                "line_number": line_idx + 1
+            }
+            continue
+        yield {
+            "left": list(map(to_token, token_ids[max(0, tok_idx - context_size):tok_idx])),
+            "match": [vocab[token_ids[tok_idx]]],  # Exact match as found
+            "right": list(map(to_token, token_ids[tok_idx + 1:tok_idx + 1 + context_size])),
+            "line_number": line_idx + 1  # 1-indexed for display
+        }
 
 
 @app.get("/")
@@ -164,7 +443,7 @@ async def api_status():
     """API status endpoint"""
     samples_dir = Path("samples")
     samples_exist = samples_dir.exists()
-    sample_count = len(list(samples_dir.glob("*.txt"))) if samples_exist else 0
+    sample_count = len(list_corpus_names()) if samples_exist else 0
     
     return {
         "message": "Concordance API v1.0", 
@@ -181,8 +460,10 @@ async def cache_status():
     cache_info = {}
     total_memory_mb = 0
     
-    for corpus_name, lines in corpora.items():
-        metadata = corpus_metadata.get(corpus_name, {})
+    with cache_lock:
+        cached = [(name, lines, corpus_metadata.get(name, {})) for name, lines in corpora.items()]
+
+    for corpus_name, lines, metadata in cached:
         # Rough memory estimation (chars * 1 byte + overhead)
         memory_estimate = sum(len(line) for line in lines) / (1024 * 1024)  # MB
         total_memory_mb += memory_estimate
@@ -197,7 +478,10 @@ async def cache_status():
         }
     
     return {
-        "cached_corpora": len(corpora),
+        "cached_corpora": len(cached),
+        "max_cached_corpora": MAX_CACHED_CORPORA,
+        "cached_search_results": len(result_cache),
+        "cached_search_results_mb": round(result_cache_bytes / (1024 * 1024), 2),
         "total_memory_mb": round(total_memory_mb, 2),
         "cache_details": cache_info
     }
@@ -206,118 +490,195 @@ async def cache_status():
 @app.post("/cache/clear")
 async def clear_cache(corpus: Optional[str] = None):
     """Clear cache for specific corpus or all corpora"""
-    if corpus:
-        if corpus in corpora:
-            del corpora[corpus]
-            if corpus in corpus_metadata:
-                del corpus_metadata[corpus]
-            return {"message": f"Cache cleared for corpus '{corpus}'"}
+    global result_cache_bytes
+    with cache_lock:
+        if corpus:
+            if corpus in corpora or corpus in file_buffers:
+                corpora.pop(corpus, None)
+                corpus_metadata.pop(corpus, None)
+                file_buffers.pop(corpus, None)
+                for key in [key for key in result_cache if key[0] == corpus]:
+                    drop_cached_result(key)
+                view_stats.pop(corpus, None)
+                return {"message": f"Cache cleared for corpus '{corpus}'"}
+            else:
+                raise HTTPException(status_code=404, detail=f"Corpus '{corpus}' not found in cache")
         else:
-            raise HTTPException(status_code=404, detail=f"Corpus '{corpus}' not found in cache")
-    else:
-        corpora.clear()
-        corpus_metadata.clear()
-        return {"message": "All cache cleared"}
+            corpora.clear()
+            corpus_metadata.clear()
+            file_buffers.clear()
+            result_cache.clear()
+            result_cache_bytes = 0
+            view_stats.clear()
+            return {"message": "All cache cleared"}
 
 
 @app.get("/corpora")
 async def list_corpora():
-    """List available corpora"""
-    samples_dir = Path("samples")
-    if not samples_dir.exists():
-        return {"corpora": []}
-    
-    txt_files = [f.stem for f in samples_dir.glob("*.txt")]
-    return {"corpora": txt_files}
+    """List available corpora (directory listing is cached until samples/ changes)"""
+    return {"corpora": list_corpus_names()}
 
 
-@app.get("/search", response_model=SearchResponse)
-async def search(
+# SearchResponse documents the schema only; the handler returns orjson-encoded bytes directly
+@app.get("/search", responses={200: {"model": SearchResponse}})
+def search(
     corpus: str = Query(..., description="Corpus name to search"),
-    query: str = Query(..., description="Search query"),
+    query: str = Query(..., description="Search query (comma-separated for multiple terms)"),
     context_size: int = Query(5, description="Context size (words before/after match)"),
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
-    page_size: int = Query(100, ge=1, le=1000, description="Results per page (max 1000)")
+    page_size: int = Query(100, ge=1, le=1000, description="Results per page (max 1000)"),
+    output_format: str = Query("text", alias="format", pattern="^(text|tokens)$",
+                               description="'text' for pre-joined context strings, 'tokens' for token lists")
 ):
     """
     Search endpoint - returns paginated KWIC hits as JSON
-    Output format: { left: [...], match: [...], right: [...] }
+    Declared sync so FastAPI runs it in its threadpool and corpus loading never blocks the event loop
+    Output format: { left_text: "...", match_text: "...", right_text: "..." }
+    or with format=tokens: { left: [...], match: [...], right: [...] }
     """
     if not query.strip():
         raise HTTPException(status_code=400, detail="Query cannot be empty")
     
     # Load corpus (uses intelligent caching)
-    lines = load_corpus(corpus)
-    
-    results = []
-    
-    # Search through each line
-    for line_num, line in enumerate(lines):
-        tokens = tokenize_line(line)
-        kwic_result = search_kwic(tokens, query, context_size)
-        
-        if kwic_result:
-            kwic_result.line_number = line_num + 1  # 1-indexed for display
-            results.append(kwic_result)
+    metadata = load_corpus(corpus)
+
+    # Serve repeated searches from the result cache; a modified corpus file changes the key
+    cache_key = (corpus, query, context_size, page, page_size, output_format, metadata['mtime'], metadata['size'])
+    cached_body = get_cached_result(cache_key)
+    if cached_body is not None:
+        return Response(content=cached_body, media_type="application/json")
+
+    # Look up matching lines in the inverted index instead of scanning the whole corpus
+    index = metadata['postings']
+    terms = split_query_terms(query)
+    if len(terms) == 1:
+        postings = index.get(terms[0].lower(), [])
+    else:
+        postings = merge_postings([index.get(term.lower(), []) for term in terms])
     
     # Calculate pagination
-    total_hits = len(results)
+    total_hits = len(postings)
     total_pages = (total_hits + page_size - 1) // page_size if total_hits > 0 else 0
     
     # Validate page number
     if page > total_pages and total_pages > 0:
         raise HTTPException(status_code=400, detail=f"Page {page} does not exist. Total pages: {total_pages}")
     
-    # Apply pagination
+    # Apply pagination - slicing the postings list touches only the requested page
     start_idx = (page - 1) * page_size
     end_idx = start_idx + page_size
-    paginated_results = results[start_idx:end_idx]
+    paginated_results = list(iter_kwic_hits(
+        metadata['vocab'], metadata['token_ids_per_line'], postings[start_idx:end_idx], context_size,
+        as_text=output_format == "text"
+    ))
     
-    return SearchResponse(
-        query=query,
-        corpus=corpus,
-        results=paginated_results,
-        total_hits=total_hits,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    # orjson serializes in C, much faster than the stdlib json encoder for large KWIC pages
+    body = orjson.dumps({
+        "query": query,
+        "corpus": corpus,
+        "results": paginated_results,
+        "total_hits": total_hits,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages
+    })
+    cache_result(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+def get_view_stats(corpus: str, corpus_path: Path, content: Optional[str] = None,
+                   file_stat: Optional[os.stat_result] = None) -> Dict[str, int]:
+    """Line/word/char counts of a corpus file as /view reports them, computed once per file version
+
+    Callers passing content must also pass the stat taken before reading it, so counts
+    from an older read are never cached under a newer mtime/size.
+    """
+    if file_stat is None:
+        content = None  # Re-read below, after the stat
+        file_stat = corpus_path.stat()
+    with cache_lock:
+        cached = view_stats.get(corpus)
+    if cached is not None and cached[:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+        return cached[2]
+
+    if content is None:
+        with open(corpus_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    stats = {
+        "line_count": content.count('\n') + 1,
+        # Count words line by line so only one line's words exist at a time,
+        # rather than a list of every word in the file
+        "word_count": sum(len(line.split()) for line in content.split('\n')),
+        "char_count": len(content)
+    }
+    with cache_lock:
+        view_stats[corpus] = (file_stat.st_mtime_ns, file_stat.st_size, stats)
+    return stats
 
 
-@app.get("/view/{corpus}", response_model=FileContent)
-async def view_file(corpus: str):
+# FileContent documents the schema only; the response is built without Pydantic validation
+@app.get("/view/{corpus}", responses={200: {"model": FileContent}})
+def view_file(corpus: str):
     """
     File viewing endpoint - returns full file content with metadata
     """
-    corpus_path = Path("samples") / f"{corpus}.txt"
-    
-    if not corpus_path.exists():
-        raise HTTPException(status_code=404, detail=f"Corpus '{corpus}' not found")
+    corpus_path = resolve_corpus_path(corpus)
     
     try:
+        file_stat = corpus_path.stat()
         with open(corpus_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Calculate metadata
-        lines = content.split('\n')
-        line_count = len(lines)
-        word_count = len(content.split())
-        char_count = len(content)
-        
-        return FileContent(
-            filename=f"{corpus}.txt",
-            content=content,
-            line_count=line_count,
-            word_count=word_count,
-            char_count=char_count
-        )
+        return Response(content=orjson.dumps({
+            "filename": f"{corpus}.txt",
+            "content": content,
+            **get_view_stats(corpus, corpus_path, content, file_stat)
+        }), media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
 
 
+@app.get("/view/{corpus}/meta")
+def view_file_meta(corpus: str):
+    """
+    File metadata endpoint - line, word and character counts without the content
+    """
+    corpus_path = resolve_corpus_path(corpus)
+
+    try:
+        return {"filename": f"{corpus}.txt", **get_view_stats(corpus, corpus_path)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
+
+
+@app.get("/view/{corpus}/content")
+def view_file_content(corpus: str):
+    """
+    File content endpoint - streams the raw file as text/plain, counts in X-Line-Count/X-Word-Count/X-Char-Count
+
+    The body is sent straight from disk instead of being decoded and re-encoded as a JSON string.
+    """
+    corpus_path = resolve_corpus_path(corpus)
+
+    try:
+        stats = get_view_stats(corpus, corpus_path)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
+
+    return FileResponse(
+        corpus_path,
+        media_type="text/plain",
+        headers={
+            "X-Line-Count": str(stats["line_count"]),
+            "X-Word-Count": str(stats["word_count"]),
+            "X-Char-Count": str(stats["char_count"])
+        }
+    )
+
+
 @app.get("/search-in-file/{corpus}")
-async def search_in_file(
+def search_in_file(
     corpus: str,
     query: str = Query(..., description="Search query"),
     case_sensitive: bool = Query(False, description="Case sensitive search")
@@ -328,38 +689,40 @@ async def search_in_file(
     if not query.strip():
         raise HTTPException(status_code=400, detail="Query cannot be empty")
     
-    corpus_path = Path("samples") / f"{corpus}.txt"
-    
-    if not corpus_path.exists():
-        raise HTTPException(status_code=404, detail=f"Corpus '{corpus}' not found")
-    
-    try:
-        with open(corpus_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        results = []
-        search_query = query if case_sensitive else query.lower()
-        
-        for line_num, line in enumerate(lines, 1):
-            search_line = line if case_sensitive else line.lower()
-            if search_query in search_line:
-                results.append({
-                    "line_number": line_num,
-                    "content": line.strip(),
-                    "matches": line.count(query) if case_sensitive else line.lower().count(search_query)
-                })
-        
-        return {
-            "query": query,
-            "corpus": corpus,
-            "case_sensitive": case_sensitive,
-            "results": results,
-            "total_lines_matched": len(results),
-            "total_matches": sum(r["matches"] for r in results)
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error searching file: {str(e)}")
+    # Both buffers come from one cache entry, so they are the same file version;
+    # the search index is not needed here, so the corpus is never tokenized
+    buffers = load_file_buffers(corpus)
+    data, line_offsets = load_file_bytes(buffers)
+    haystack, hay_offsets = load_file_bytes(buffers, case_sensitive)
+
+    # Everything that can fail happens before streaming starts: once the 200 is sent, an error
+    # could only truncate the body. The file was validated as UTF-8 when it was loaded.
+    needle = (query if case_sensitive else query.lower()).encode('utf-8')
+    header = orjson.dumps({"query": query, "corpus": corpus, "case_sensitive": case_sensitive})
+
+    def generate() -> Iterator[bytes]:
+        # Lines are scanned and emitted as they are found, so memory stays flat however many lines match;
+        # the totals are only known at the end, hence they close the object
+        chunk = bytearray(header[:-1] + b',"results":[')
+        lines_matched = total_matches = 0
+        for line_idx, matches in iter_line_matches(haystack, hay_offsets, needle):
+            line_end = line_offsets[line_idx + 1] if line_idx + 1 < len(line_offsets) else len(data)
+            if lines_matched:
+                chunk += b','
+            chunk += orjson.dumps({
+                "line_number": line_idx + 1,
+                "content": data[line_offsets[line_idx]:line_end].decode('utf-8').rstrip('\r\n'),  # Keep indentation
+                "matches": matches
+            })
+            lines_matched += 1
+            total_matches += matches
+            if len(chunk) >= STREAM_CHUNK_BYTES:
+                yield bytes(chunk)
+                chunk.clear()
+        chunk += b'],"total_lines_matched":%d,"total_matches":%d}' % (lines_matched, total_matches)
+        yield bytes(chunk)
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 # Placeholder for spaCy integration (v1.5+)
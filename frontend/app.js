@@ -171,19 +171,7 @@ async function handleViewFile() {
     try {
         hideAllSections();
         
-        const url = `${API_BASE_URL}/view/${encodeURIComponent(currentCorpus)}`;
-        console.log('Fetching URL:', url); // Debug log
-        
-        const response = await fetch(url);
-        
-        console.log('Response status:', response.status); // Debug log
-        
-        if (!response.ok) {
-            const errorData = await response.json();
-            throw new Error(errorData.detail || 'Failed to load file');
-        }
-        
-        const data = await response.json();
+        const data = await fetchFileContent(currentCorpus);
         displayFileContent(data);
         
         // Show search section after file is loaded
@@ -248,14 +236,7 @@ async function handleClearSearch() {
     try {
         hideAllSections();
         
-        const response = await fetch(`${API_BASE_URL}/view/${encodeURIComponent(currentCorpus)}`);
-        
-        if (!response.ok) {
-            const errorData = await response.json();
-            throw new Error(errorData.detail || 'Failed to load file');
-        }
-        
-        const data = await response.json();
+        const data = await fetchFileContent(currentCorpus);
         displayFileContent(data);
         
     } catch (error) {
@@ -264,6 +245,32 @@ async function handleClearSearch() {
     }
 }
 
+/**
+ * Fetch a corpus file as plain text, with its counts from the response headers
+ */
+async function fetchFileContent(corpus) {
+    const url = `${API_BASE_URL}/view/${encodeURIComponent(corpus)}/content`;
+    console.log('Fetching URL:', url); // Debug log
+    
+    const response = await fetch(url);
+    
+    console.log('Response status:', response.status); // Debug log
+    
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.detail || 'Failed to load file');
+    }
+    
+    const text = await response.text();
+    return {
+        filename: `${corpus}.txt`,
+        content: text.replace(/\r\n?/g, '\n'),  // Raw file bytes; normalize newlines like /view does
+        line_count: Number(response.headers.get('X-Line-Count')),
+        word_count: Number(response.headers.get('X-Word-Count')),
+        char_count: Number(response.headers.get('X-Char-Count'))
+    };
+}
+
 /**
  * Display file content
  */